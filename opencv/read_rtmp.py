@@ -9,23 +9,49 @@ def main() -> None:
         "--display", action="store_true", help="Show the stream in a window"
     )
     parser.add_argument("--save", help="Optional path to save frames as video (MP4)")
+    parser.add_argument(
+        "--encode-width",
+        type=int,
+        help="Downscale frames to this width before encoding (default: capture width)",
+    )
+    parser.add_argument(
+        "--encode-height",
+        type=int,
+        help="Downscale frames to this height before encoding (default: capture height)",
+    )
     args = parser.parse_args()
 
     cap = cv2.VideoCapture(args.url)
     if not cap.isOpened():
         raise RuntimeError(f"Unable to open stream: {args.url}")
 
+    # Keep the decoder-side queue shallow so a brief stall serves the newest
+    # frame instead of a growing backlog (best effort; not every backend
+    # honors this property).
+    cap.set(cv2.CAP_PROP_BUFFERSIZE, 1)
+
     writer = None
+    encode_size = None
     if args.save:
         fourcc = cv2.VideoWriter_fourcc(*"mp4v")
         fps = cap.get(cv2.CAP_PROP_FPS) or 30.0
         width = int(cap.get(cv2.CAP_PROP_FRAME_WIDTH))
         height = int(cap.get(cv2.CAP_PROP_FRAME_HEIGHT))
-        writer = cv2.VideoWriter(args.save, fourcc, fps, (width, height))
+        # Encoding at a reduced resolution cuts the per-frame DCT work
+        # roughly with the pixel count; most archived streams don't need
+        # full capture resolution.
+        encode_size = (args.encode_width or width, args.encode_height or height)
+        if encode_size == (width, height):
+            encode_size = None
+        writer = cv2.VideoWriter(args.save, fourcc, fps, encode_size or (width, height))
 
     try:
         while True:
-            ret, frame = cap.read()
+            # grab()/retrieve() split: grab is cheap, so decode work is only
+            # spent on frames we actually keep.
+            if not cap.grab():
+                break
+            ret, frame = cap.retrieve()
             if not ret:
                 break
             if args.display:
@@ -33,6 +59,8 @@ def main() -> None:
                 if cv2.waitKey(1) & 0xFF == ord("q"):
                     break
             if writer is not None:
+                if encode_size is not None:
+                    frame = cv2.resize(frame, encode_size, interpolation=cv2.INTER_AREA)
                 writer.write(frame)
     finally:
         cap.release()
@@ -1,28 +1,191 @@
 #!/usr/bin/env python3
+import errno
+import io
+import mmap
 import os
+import shutil
+import struct
 import zipfile
+from collections import deque
+from concurrent.futures import ProcessPoolExecutor, as_completed
 from pathlib import Path
 
+# Intel ISA-L ships a SIMD (AVX2/AVX-512) inflate that decompresses
+# 2-3x faster than stdlib zlib. zipfile only needs decompressobj/crc32,
+# both of which isal_zlib provides, so the module can be swapped in.
+try:
+    from isal import isal_zlib
+    zipfile.zlib = isal_zlib
+except ImportError:
+    pass
+
+# Hand-history archives hold multi-MB text files; a big copy buffer keeps
+# the read/write syscall count low versus shutil's default 64KB.
+COPY_BUFFER_SIZE = 4 * 1024 * 1024
+
+class _MmapStream(io.RawIOBase):
+    """File-like view over an mmap (mmap itself lacks seekable() before 3.13)"""
+
+    def __init__(self, mm):
+        self._mm = mm
+
+    def readable(self):
+        return True
+
+    def seekable(self):
+        return True
+
+    def readinto(self, buf):
+        data = self._mm.read(len(buf))
+        buf[: len(data)] = data
+        return len(data)
+
+    def seek(self, pos, whence=os.SEEK_SET):
+        # Real file objects raise OSError for out-of-range seeks and
+        # zipfile's end-of-central-directory probing relies on that;
+        # mmap raises ValueError instead, so translate it.
+        try:
+            self._mm.seek(pos, whence)
+        except ValueError as exc:
+            raise OSError(errno.EINVAL, str(exc)) from None
+        return self._mm.tell()
+
+    def tell(self):
+        return self._mm.tell()
+
+def _stored_member_data_offset(fp, info):
+    """Locate the raw data of a ZIP_STORED member inside the archive file"""
+    # The local header repeats name/extra fields with lengths that may
+    # differ from the central directory, so read them from the header
+    # itself (fixed part is 30 bytes; lengths sit at offsets 26 and 28).
+    fp.seek(info.header_offset + 26)
+    name_len, extra_len = struct.unpack("<HH", fp.read(4))
+    return info.header_offset + 30 + name_len + extra_len
+
+def _sendfile_stored_member(zip_ref, info, target, src_fd):
+    """Zero-copy extraction of an uncompressed member via os.sendfile"""
+    if src_fd is None or not hasattr(os, "sendfile"):
+        return False
+    offset = _stored_member_data_offset(zip_ref.fp, info)
+    remaining = info.file_size
+    with open(target, "wb") as dst:
+        while remaining > 0:
+            sent = os.sendfile(dst.fileno(), src_fd, offset, remaining)
+            if sent == 0:
+                return False
+            offset += sent
+            remaining -= sent
+    return True
+
+def _already_extracted(target, info, zip_mtime):
+    """True when a previous run already produced this member on disk"""
+    try:
+        stat = target.stat()
+    except OSError:
+        return False
+    return stat.st_size == info.file_size and stat.st_mtime >= zip_mtime
+
+def _extract_member(zip_ref, info, dest_dir, zip_mtime, archive_fd=None):
+    """Stream one member to disk with a large copy buffer"""
+    # extractall() sanitized member names; the manual target computation
+    # must do the same, or a crafted name like ../../x in a third-party
+    # archive escapes the destination tree (zip-slip).
+    target = (dest_dir / info.filename).resolve()
+    if not target.is_relative_to(dest_dir.resolve()):
+        print(f"Skipping unsafe member path: {info.filename}")
+        return
+    if info.is_dir():
+        target.mkdir(parents=True, exist_ok=True)
+        return
+    # Crash/resume runs should not redo inflate and write work that
+    # already completed.
+    if _already_extracted(target, info, zip_mtime):
+        return
+    target.parent.mkdir(parents=True, exist_ok=True)
+    # Stored members need no inflate pass, so they can be spliced
+    # kernel-side straight from the archive (skips the CRC pass, which
+    # is fine for a bulk local extract).
+    if info.compress_type == zipfile.ZIP_STORED:
+        if _sendfile_stored_member(zip_ref, info, target, archive_fd):
+            return
+    with zip_ref.open(info) as src, open(target, "wb") as dst:
+        shutil.copyfileobj(src, dst, length=COPY_BUFFER_SIZE)
+
+def _extract_one(zip_path):
+    """Extract a single archive and return any nested zips it contained"""
+    zip_path = Path(zip_path)
+    zip_mtime = zip_path.stat().st_mtime
+    # Parsing the archive through a read-only mmap lets the kernel serve
+    # the central directory and member data from the page cache instead
+    # of buffered read() calls; the raw fd sticks around for sendfile.
+    with open(zip_path, "rb") as f:
+        with mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ) as mm:
+            with zipfile.ZipFile(_MmapStream(mm)) as zip_ref:
+                names = zip_ref.namelist()
+                for info in zip_ref.infolist():
+                    _extract_member(
+                        zip_ref, info, zip_path.parent, zip_mtime, f.fileno()
+                    )
+    os.remove(zip_path)
+    return [zip_path.parent / name for name in names if name.endswith(".zip")]
+
+def _extract_sequentially(queue):
+    extracted = 0
+    while queue:
+        zip_path = queue.popleft()
+        try:
+            print(f"Extracting: {zip_path}")
+            queue.extend(_extract_one(zip_path))
+            extracted += 1
+        except Exception as e:
+            print(f"Error extracting {zip_path}: {e}")
+    return extracted
+
+def _extract_in_parallel(queue, workers):
+    extracted = 0
+    with ProcessPoolExecutor(max_workers=workers) as executor:
+        pending = {executor.submit(_extract_one, zp): zp for zp in queue}
+        queue.clear()
+        while pending:
+            # Snapshot the current wave; nested zips found while it runs are
+            # submitted behind it and picked up on the next pass.
+            for future in as_completed(list(pending)):
+                zip_path = pending.pop(future)
+                try:
+                    nested = future.result()
+                except Exception as e:
+                    print(f"Error extracting {zip_path}: {e}")
+                    continue
+                print(f"Extracted: {zip_path}")
+                extracted += 1
+                for nested_path in nested:
+                    pending[executor.submit(_extract_one, nested_path)] = nested_path
+    return extracted
+
 def extract_all_zips(root_dir):
-    """Recursively extract all zip files in directory"""
+    """Extract all zip files in directory, following nested zips via a work queue"""
     root_path = Path(root_dir)
 
-    while True:
-        zip_files = list(root_path.rglob("*.zip"))
-        if not zip_files:
-            print("All zips extracted!")
-            break
-
-        print(f"Found {len(zip_files)} zip files to extract...")
-
-        for zip_path in zip_files:
-            try:
-                print(f"Extracting: {zip_path}")
-                with zipfile.ZipFile(zip_path, 'r') as zip_ref:
-                    zip_ref.extractall(zip_path.parent)
-                os.remove(zip_path)
-            except Exception as e:
-                print(f"Error extracting {zip_path}: {e}")
+    queue = deque(root_path.rglob("*.zip"))
+    if not queue:
+        print("No zip files found.")
+        return
+
+    print(f"Found {len(queue)} zip files to extract...")
+
+    # DEFLATE decompression is CPU-bound and zlib releases the GIL, so
+    # independent archives inflate well across cores.
+    workers = min(os.cpu_count() or 1, len(queue))
+    if workers > 1:
+        try:
+            extracted = _extract_in_parallel(queue, workers)
+        except PermissionError:
+            print("Multiprocessing unavailable in this environment, extracting sequentially.")
+            extracted = _extract_sequentially(queue)
+    else:
+        extracted = _extract_sequentially(queue)
+
+    print(f"All zips extracted! ({extracted} archives)")
 
 if __name__ == "__main__":
     extract_all_zips("hands")
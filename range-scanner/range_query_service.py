@@ -16,49 +16,68 @@ from __future__ import annotations
 import argparse
 import json
 import duckdb
+import numpy as np
+from collections import OrderedDict
 from dataclasses import dataclass
 from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
 from pathlib import Path
-from statistics import median
 from typing import Dict, List, Optional, Tuple
 from urllib.parse import parse_qs, urlparse
 
+# Optional C-accelerated HTTP stack (httptools parsing, uvloop event
+# loop): framework overhead per request drops from ~100µs of Python
+# header/query handling to low microseconds. The stdlib threading
+# server below stays as the fallback.
+try:
+    import uvicorn
+    from fastapi import FastAPI, HTTPException
+    from fastapi.middleware.cors import CORSMiddleware
+except ImportError:
+    uvicorn = None
 
-HAND_RANK_ORDER = "AKQJT98765432"
 
+def build_summary(hands: List[str], counts: np.ndarray) -> Dict:
+    """Convert parallel hand/count columns into frequency stats.
 
-def hand_rank_key(hand: str) -> Tuple[int, int]:
-    """Sort pocket pairs ahead of suited/off-suit combos."""
-    if len(hand) == 2:
-        return (-100, HAND_RANK_ORDER.index(hand[0]))
-    first = HAND_RANK_ORDER.index(hand[0])
-    second = HAND_RANK_ORDER.index(hand[1]) if len(hand) > 1 else first
-    return (-10, first * 2 + second)
-
-
-def build_summary(rows: List[Tuple[str, int]]) -> Dict:
-    """Convert (hand, count) rows into frequency stats."""
-    total = sum(count for _, count in rows)
-    summary = {}
-    for hand, count in sorted(rows, key=lambda item: hand_rank_key(item[0])):
-        freq = (count / total * 100) if total else 0
-        summary[hand] = {
-            "count": count,
-            "frequency_pct": round(freq, 2),
+    Hands are expected already rank-ordered (the grouped query sorts on
+    HAND_RANK_EXPR), so the summary dict keeps their arrival order.
+    """
+    # Counts stay columnar: the total and the frequency vector come from
+    # one numpy reduction and one vectorized expression, with conversion
+    # to Python ints/floats deferred to the final dict build.
+    count_list = counts.tolist()
+    total = int(counts.sum()) if count_list else 0
+    if total:
+        # One division up front; the per-hand work is then a single
+        # vectorized multiply instead of a divide per element.
+        scale = 100.0 / total
+        freqs = np.round(counts * scale, 2).tolist()
+    else:
+        freqs = [0] * len(hands)
+    summary = {
+        hand: {
+            "count": count_list[i],
+            "frequency_pct": freqs[i],
         }
-    counts = [count for _, count in rows]
-    median_pct = (median(counts) / total * 100) if total and counts else 0
+        for i, hand in enumerate(hands)
+    }
+    # np.median quickselects the columnar counts natively instead of
+    # statistics.median's full Python sort.
+    median_pct = float(np.median(counts)) * scale if total and count_list else 0
     return {
         "hands": summary,
         "total_instances": total,
-        "unique_combos": len(rows),
+        "unique_combos": len(hands),
         "median_frequency_pct": round(median_pct, 2),
     }
 
 
-@dataclass
+@dataclass(frozen=True)
 class RangeQueryFilters:
-    """Filter payload used by the HTTP API and CLI."""
+    """Filter payload used by the HTTP API and CLI.
+
+    Frozen so instances hash and can key the service's result cache.
+    """
 
     position: Optional[str] = None
     stage: Optional[str] = None
@@ -78,119 +97,243 @@ class RangeQueryFilters:
 class RangeQueryService:
     """Executes aggregate range queries against the DuckDB warehouse."""
 
+    # Canonical clause per filter attribute; order here fixes both the
+    # WHERE text and the parameter binding order for the cache below.
+    _FILTER_CLAUSES = (
+        ("position", "ro.position = ?"),
+        ("stage", "ro.stage = ?"),
+        ("action", "ro.action = ?"),
+        ("tournament_stage", "ro.tournament_stage = ?"),
+        ("pot_bucket", "ro.pot_bucket = ?"),
+        ("bb_bucket", "ro.bb_bucket = ?"),
+        ("stack_bucket", "ro.stack_bucket = ?"),
+        ("player", "ro.player = ?"),
+        ("tournament_id", "ro.tournament_id = ?"),
+        ("cards", "ro.cards = ?"),
+        ("stack_bb_min", "ro.stack_size_bb >= ?"),
+        ("stack_bb_max", "ro.stack_size_bb <= ?"),
+    )
+
+    # SQL twin of the old Python hand-rank table: pocket pairs sort
+    # first by high card, then suited/off-suit combos by both cards
+    # (suffix-insensitive, with the hand text as tiebreak in the query).
+    HAND_RANK_EXPR = """
+        CASE WHEN length(ro.cards) = 2
+             THEN -1000 + strpos('AKQJT98765432', substr(ro.cards, 1, 1)) - 1
+             ELSE (strpos('AKQJT98765432', substr(ro.cards, 1, 1)) - 1) * 2
+                  + strpos('AKQJT98765432', substr(ro.cards, 2, 1)) - 1
+        END
+    """
+
     BASE_FROM = """
         FROM range_occurrences ro
     """
 
+    # Pre-aggregated roll-up written by the exporter; usable whenever the
+    # request only filters on dimensions the cube carries.
+    CUBE_FROM = """
+        FROM range_cube ro
+    """
+
     def __init__(self, db_path: Path):
         self.db_path = Path(db_path)
         if not self.db_path.exists():
             raise FileNotFoundError(f"Database {self.db_path} not found.")
+        self._has_cube: Optional[bool] = None
+        # WHERE text + parameter order keyed by the set of active filter
+        # names; the hot position/stage/action path hits the cache after
+        # the first request instead of rebuilding clause strings.
+        self._where_cache: Dict[frozenset, Tuple[str, Tuple[str, ...]]] = {}
+        # LRU of full query results keyed by the frozen filter payload.
+        # The warehouse is static for the service's lifetime, so entries
+        # never go stale; the bound just caps memory.
+        self._result_cache: "OrderedDict[RangeQueryFilters, Dict]" = OrderedDict()
+        # One long-lived read-only connection; per-request cursors branch
+        # off it and share the catalog and buffer pool, so requests skip
+        # the connect/open cost entirely.
+        self._conn = duckdb.connect(self.db_path.as_posix(), read_only=True)
+
+    def close(self):
+        self._conn.close()
+
+    # GROUPING_ID bitmask per grouping set: a set bit means the column is
+    # rolled up in that row. Bit order follows the GROUPING_ID argument
+    # list (pot_bucket, bb_bucket, stack_bucket, tournament_stage).
+    _GID_ALL = 0b1111
+    _GID_POT = 0b0111
+    _GID_BB = 0b1011
+    _GID_STACK = 0b1101
+    _GID_TOURNAMENT = 0b1110
+
+    RESULT_CACHE_SIZE = 1024
 
     def query_ranges(self, filters: RangeQueryFilters) -> Dict:
         if not (filters.position and filters.stage and filters.action):
             raise ValueError("position, stage, and action filters are required")
 
-        with duckdb.connect(self.db_path.as_posix()) as conn:
+        # Viewers re-request the same filter combinations; pop+reinsert
+        # keeps the hit most-recently-used. Results are shared between
+        # callers and must be treated as read-only.
+        result = self._result_cache.pop(filters, None)
+        if result is None:
+            result = self._query_ranges_uncached(filters)
+        self._result_cache[filters] = result
+        while len(self._result_cache) > self.RESULT_CACHE_SIZE:
+            self._result_cache.popitem(last=False)
+        return result
+
+    def _query_ranges_uncached(self, filters: RangeQueryFilters) -> Dict:
+        # Cursors are cheap thread-safe branches of the shared connection.
+        with self._conn.cursor() as conn:
             where_clause, params = self._build_where(filters)
-
-            all_rows = self._query_all(conn, where_clause, params, filters.limit)
-            pot_rows = self._query_bucket(
-                conn, where_clause, params, "COALESCE(ro.pot_bucket, 'N/A')"
-            )
-            bb_rows = self._query_bucket(
-                conn, where_clause, params, "COALESCE(ro.bb_bucket, 'N/A')"
-            )
-            stack_rows = self._query_bucket(
-                conn, where_clause, params, "COALESCE(ro.stack_bucket, 'UNKNOWN')"
-            )
-            tournament_rows = self._query_bucket(
-                conn, where_clause, params, "COALESCE(ro.tournament_stage, 'UNKNOWN')"
+            use_cube = self._cube_covers(filters) and self._cube_exists(conn)
+            all_columns, bucket_columns = self._query_grouped(
+                conn, where_clause, params, filters.limit, use_cube
             )
 
         return {
             "filters": filters.__dict__,
-            "all": build_summary(all_rows),
-            "by_pot_size": self._group_bucket_rows(pot_rows),
-            "by_bb_size": self._group_bucket_rows(bb_rows),
-            "by_stack_bucket": self._group_bucket_rows(stack_rows),
-            "by_tournament_stage": self._group_bucket_rows(tournament_rows),
+            "all": build_summary(*all_columns),
+            "by_pot_size": self._group_bucket_rows(*bucket_columns[self._GID_POT]),
+            "by_bb_size": self._group_bucket_rows(*bucket_columns[self._GID_BB]),
+            "by_stack_bucket": self._group_bucket_rows(
+                *bucket_columns[self._GID_STACK]
+            ),
+            "by_tournament_stage": self._group_bucket_rows(
+                *bucket_columns[self._GID_TOURNAMENT]
+            ),
         }
 
     def _build_where(self, filters: RangeQueryFilters) -> Tuple[str, List]:
-        clauses: List[str] = []
-        params: List = []
-        mapping = {
-            "position": ("ro.position = ?", filters.position),
-            "stage": ("ro.stage = ?", filters.stage),
-            "action": ("ro.action = ?", filters.action),
-            "tournament_stage": ("ro.tournament_stage = ?", filters.tournament_stage),
-            "pot_bucket": ("ro.pot_bucket = ?", filters.pot_bucket),
-            "bb_bucket": ("ro.bb_bucket = ?", filters.bb_bucket),
-            "stack_bucket": ("ro.stack_bucket = ?", filters.stack_bucket),
-            "player": ("ro.player = ?", filters.player),
-            "tournament_id": ("ro.tournament_id = ?", filters.tournament_id),
-            "cards": ("ro.cards = ?", filters.cards),
-        }
-        for _, (clause, value) in mapping.items():
-            if value:
-                clauses.append(clause)
-                params.append(value)
-
-        if filters.stack_bb_min is not None:
-            clauses.append("ro.stack_size_bb >= ?")
-            params.append(filters.stack_bb_min)
-        if filters.stack_bb_max is not None:
-            clauses.append("ro.stack_size_bb <= ?")
-            params.append(filters.stack_bb_max)
-
-        where_clause = "WHERE " + " AND ".join(clauses) if clauses else ""
-        return where_clause, params
-
-    def _query_all(
+        # Requests overwhelmingly repeat a handful of filter
+        # combinations, so the clause text is cached per set of active
+        # names and each request only reads the attribute values back in
+        # the cached binding order.
+        active = [
+            name
+            for name, _ in self._FILTER_CLAUSES
+            if getattr(filters, name) not in (None, "")
+        ]
+        key = frozenset(active)
+        cached = self._where_cache.get(key)
+        if cached is None:
+            active_set = key
+            clauses = [
+                clause
+                for name, clause in self._FILTER_CLAUSES
+                if name in active_set
+            ]
+            where_clause = "WHERE " + " AND ".join(clauses) if clauses else ""
+            cached = (where_clause, tuple(active))
+            self._where_cache[key] = cached
+        where_clause, param_names = cached
+        return where_clause, [getattr(filters, name) for name in param_names]
+
+    def _cube_covers(self, filters: RangeQueryFilters) -> bool:
+        """True when every active filter is a dimension of range_cube"""
+        return not (
+            filters.player
+            or filters.tournament_id
+            or filters.stack_bb_min is not None
+            or filters.stack_bb_max is not None
+        )
+
+    def _cube_exists(self, conn: duckdb.DuckDBPyConnection) -> bool:
+        # Databases exported before the cube existed fall back to the
+        # fact table; probe once and remember.
+        if self._has_cube is None:
+            self._has_cube = bool(
+                conn.execute(
+                    "SELECT 1 FROM duckdb_tables() WHERE table_name = 'range_cube'"
+                ).fetchone()
+            )
+        return self._has_cube
+
+    def _query_grouped(
         self,
         conn: duckdb.DuckDBPyConnection,
         where_clause: str,
         params: List,
         limit: Optional[int],
-    ) -> List[Tuple[str, int]]:
-        query = f"""
-            SELECT ro.cards AS hand, COUNT(*) AS count
-            {self.BASE_FROM}
-            {where_clause}
-            GROUP BY ro.cards
-            ORDER BY count DESC
+        use_cube: bool = False,
+    ) -> Tuple[List[Tuple[str, int]], Dict[int, List[Tuple[str, str, int]]]]:
+        """Run the overall and all four bucket aggregations in one scan
+
+        The previous implementation issued five GROUP BY statements over
+        the same filtered rows; GROUPING SETS computes them in a single
+        pass and GROUPING_ID tells the demux loop which set a row
+        belongs to. When the cube covers the filters the scan runs over
+        its pre-aggregated rows, summing the stored counts.
         """
-        if limit:
-            query += " LIMIT ?"
-            params = params + [limit]
-        cursor = conn.execute(query, params)
-        return cursor.fetchall()
-
-    def _query_bucket(
-        self,
-        conn: duckdb.DuckDBPyConnection,
-        where_clause: str,
-        params: List,
-        bucket_expr: str,
-    ) -> List[Tuple[str, str, int]]:
+        source = self.CUBE_FROM if use_cube else self.BASE_FROM
+        count_expr = "SUM(ro.count)::BIGINT" if use_cube else "COUNT(*)"
         query = f"""
-            SELECT {bucket_expr} AS bucket, ro.cards AS hand, COUNT(*) AS count
-            {self.BASE_FROM}
+            SELECT GROUPING_ID(
+                       ro.pot_bucket, ro.bb_bucket,
+                       ro.stack_bucket, ro.tournament_stage
+                   ) AS gid,
+                   COALESCE(ro.pot_bucket, 'N/A') AS pot_bucket,
+                   COALESCE(ro.bb_bucket, 'N/A') AS bb_bucket,
+                   COALESCE(ro.stack_bucket, 'UNKNOWN') AS stack_bucket,
+                   COALESCE(ro.tournament_stage, 'UNKNOWN') AS tournament_stage,
+                   ro.cards AS hand,
+                   {count_expr} AS count,
+                   {self.HAND_RANK_EXPR} AS hand_rank
+            {source}
             {where_clause}
-            GROUP BY bucket, ro.cards
-            ORDER BY bucket, count DESC
+            GROUP BY GROUPING SETS (
+                (ro.cards),
+                (ro.pot_bucket, ro.cards),
+                (ro.bb_bucket, ro.cards),
+                (ro.stack_bucket, ro.cards),
+                (ro.tournament_stage, ro.cards)
+            )
+            ORDER BY hand_rank, hand
         """
-        cursor = conn.execute(query, params)
-        return cursor.fetchall()
-
-    def _group_bucket_rows(self, rows: List[Tuple[str, str, int]]) -> Dict[str, Dict]:
-        grouped: Dict[str, List[Tuple[str, int]]] = {}
-        for bucket, hand, count in rows:
-            grouped.setdefault(bucket, []).append((hand, count))
+        # fetchnumpy() hands back whole columns, skipping the per-row
+        # Python tuple and per-value boxing of fetchall; the demux below
+        # is boolean masking instead of a Python loop over rows.
+        columns = conn.execute(query, params).fetchnumpy()
+        gids = np.asarray(columns["gid"])
+        hands = np.asarray(columns["hand"], dtype=object)
+        counts = np.asarray(columns["count"])
+
+        all_mask = gids == self._GID_ALL
+        all_hands = hands[all_mask]
+        all_counts = counts[all_mask]
+        if limit:
+            # Old behavior: ORDER BY count DESC with the LIMIT applied
+            # before the rank ordering, so the surviving top slice is
+            # put back into rank order for the summary.
+            top = np.sort(np.argsort(-all_counts, kind="stable")[:limit])
+            all_hands = all_hands[top]
+            all_counts = all_counts[top]
+
+        bucket_source = {
+            self._GID_POT: "pot_bucket",
+            self._GID_BB: "bb_bucket",
+            self._GID_STACK: "stack_bucket",
+            self._GID_TOURNAMENT: "tournament_stage",
+        }
+        bucket_columns = {}
+        for gid, column_name in bucket_source.items():
+            mask = gids == gid
+            buckets = np.asarray(columns[column_name], dtype=object)[mask]
+            bucket_columns[gid] = (buckets, hands[mask], counts[mask])
+        return (all_hands.tolist(), all_counts), bucket_columns
+
+    def _group_bucket_rows(
+        self, buckets: np.ndarray, hands: np.ndarray, counts: np.ndarray
+    ) -> Dict[str, Dict]:
+        # np.unique returns buckets in ascending order, matching the old
+        # ORDER BY bucket key order. return_inverse gives each row its
+        # bucket ordinal, so the per-bucket masks compare a small int
+        # array instead of re-scanning the object-dtype strings.
+        unique_buckets, inverse = np.unique(buckets, return_inverse=True)
         return {
-            bucket: build_summary(bucket_rows)
-            for bucket, bucket_rows in grouped.items()
+            bucket: build_summary(hands[mask].tolist(), counts[mask])
+            for index, bucket in enumerate(unique_buckets)
+            for mask in (inverse == index,)
         }
 
 
@@ -265,7 +408,10 @@ class _APIRequestHandler(BaseHTTPRequestHandler):
         )
 
     def _send_response(self, status_code: int, payload: Dict):
-        body = json.dumps(payload, indent=2).encode("utf-8")
+        # Compact separators, no indentation: pretty-printing a ranges
+        # payload costs extra formatting work and roughly a third more
+        # bytes on the wire. The CLI keeps indent=2 for human eyes.
+        body = json.dumps(payload, separators=(",", ":")).encode("utf-8")
         self.send_response(status_code)
         self.send_header("Access-Control-Allow-Origin", "*")
         self.send_header("Access-Control-Allow-Methods", "GET, OPTIONS")
@@ -280,6 +426,62 @@ class _APIRequestHandler(BaseHTTPRequestHandler):
         return
 
 
+def make_asgi_app(service: RangeQueryService) -> "FastAPI":
+    """Build the FastAPI app mirroring the stdlib handler's endpoints."""
+    app = FastAPI()
+    app.add_middleware(
+        CORSMiddleware,
+        allow_origins=["*"],
+        allow_methods=["GET", "OPTIONS"],
+        allow_headers=["Content-Type"],
+    )
+
+    @app.get("/health")
+    def health() -> Dict:
+        return {"status": "ok"}
+
+    # Typed query parameters replace the hand-rolled get_float/get_int
+    # coercion: FastAPI validates and converts them before the handler
+    # runs and answers malformed values with a 422 itself.
+    @app.get("/ranges")
+    def ranges(
+        position: Optional[str] = None,
+        stage: Optional[str] = None,
+        action: Optional[str] = None,
+        tournament_stage: Optional[str] = None,
+        pot_bucket: Optional[str] = None,
+        bb_bucket: Optional[str] = None,
+        stack_bucket: Optional[str] = None,
+        player: Optional[str] = None,
+        tournament_id: Optional[str] = None,
+        stack_bb_min: Optional[float] = None,
+        stack_bb_max: Optional[float] = None,
+        cards: Optional[str] = None,
+        limit: Optional[int] = None,
+    ) -> Dict:
+        filters = RangeQueryFilters(
+            position=position,
+            stage=stage,
+            action=action,
+            tournament_stage=tournament_stage,
+            pot_bucket=pot_bucket,
+            bb_bucket=bb_bucket,
+            stack_bucket=stack_bucket,
+            player=player,
+            tournament_id=tournament_id,
+            stack_bb_min=stack_bb_min,
+            stack_bb_max=stack_bb_max,
+            cards=cards,
+            limit=limit,
+        )
+        try:
+            return service.query_ranges(filters)
+        except ValueError as exc:
+            raise HTTPException(status_code=400, detail=str(exc)) from None
+
+    return app
+
+
 def make_handler(service: RangeQueryService):
     def handler(*args, **kwargs):
         _APIRequestHandler(service, *args, **kwargs)
@@ -289,20 +491,30 @@ def make_handler(service: RangeQueryService):
 
 def run_server(db_path: Path, host: str, port: int):
     service = RangeQueryService(db_path)
-    handler = make_handler(service)
-    httpd = ThreadingHTTPServer((host, port), handler)
     print(f"Range query service listening on http://{host}:{port} (db={db_path})")
     try:
-        httpd.serve_forever()
-    except KeyboardInterrupt:
-        print("\nShutting down...")
-        httpd.server_close()
+        if uvicorn is not None:
+            uvicorn.run(
+                make_asgi_app(service), host=host, port=port, log_level="warning"
+            )
+        else:
+            httpd = ThreadingHTTPServer((host, port), make_handler(service))
+            try:
+                httpd.serve_forever()
+            except KeyboardInterrupt:
+                print("\nShutting down...")
+                httpd.server_close()
+    finally:
+        service.close()
 
 
 def run_cli_query(db_path: Path, filters: RangeQueryFilters):
     service = RangeQueryService(db_path)
-    result = service.query_ranges(filters)
-    print(json.dumps(result, indent=2))
+    try:
+        result = service.query_ranges(filters)
+        print(json.dumps(result, indent=2))
+    finally:
+        service.close()
 
 
 def parse_args():